@@ -1,23 +1,171 @@
-from typing import Dict, Any, TypedDict, List, Optional
+from typing import Dict, Any, TypedDict, List, Optional, Annotated
+import argparse
 import logging
-import json
+import operator
 import os
+import sys
 from pathlib import Path
 from copy import deepcopy
-from sub_agents.patient_profiles.agent import PatientProfileAgent
-from sub_agents.regions_for_food.agent import RegionalFoodAgent
-from sub_agents.food_recommendations.agent import FoodRecommendationAgent
+from types import MappingProxyType
+from functools import lru_cache
+from bisect import bisect_right
+from itertools import chain, islice
 
 try:
-    from langgraph.graph import StateGraph, END
+    from langgraph.graph import StateGraph, START, END
 except Exception:
     StateGraph = None
+    START = None
     END = None
 
 try:
-    from langchain_openai import ChatOpenAI
+    import orjson
 except Exception:
-    ChatOpenAI = None
+    orjson = None
+
+
+# Reports are saved under the project root unless NUTRITION_REPORT_DIR points elsewhere;
+# resolved once so saves don't depend on the working directory
+_OUTPUT_DIR = Path(os.getenv("NUTRITION_REPORT_DIR") or Path(__file__).parent / "outputs").resolve()
+
+# Upper bound on one evaluator request; on timeout the heuristic evaluator answers instead
+_LLM_EVALUATION_TIMEOUT_SECONDS = 30
+
+# Constant head of the LLM evaluator prompt; only the JSON payloads vary per call
+_EVALUATOR_PROMPT_PREFIX = (
+    "You are a strict nutrition recommendation evaluator. "
+    "Evaluate quality for diabetes/portion-control safety and practical meal diversity. "
+    "Respond with strict JSON only in this format: "
+    "{\"score\": <0.0-1.0>, \"passes\": <true/false>, \"issues\": [<strings>]}.\n\n"
+)
+
+_LEAN_PROTEINS = frozenset(("fish", "chicken", "eggs"))
+
+# BMI category cut-offs; bisect_right over the cuts indexes straight into the labels
+_BMI_CUTS = (18.5, 25.0, 30.0)
+_BMI_LABELS = ("Underweight", "Normal", "Overweight", "Obese")
+
+# Dietary restriction flags and the focus area each one contributes, in display order
+_FOCUS_MAP = (
+    ("limit_sugar", "blood sugar control"),
+    ("portion_control", "portion management"),
+    ("limit_sodium", "sodium reduction"),
+    ("increase_fiber", "fiber intake"),
+)
+
+# Religion options offered in interactive mode
+_RELIGIONS = (
+    "christianity",
+    "islam",
+    "hinduism",
+    "buddhism",
+    "judaism",
+    "polytheism",
+)
+
+_RELIGION_MENU = "\n".join(f"  {i}. {value.title()}" for i, value in enumerate(_RELIGIONS, 1))
+
+# Menu choice ("1"-"6") -> religion; anything else means not specified
+_RELIGION_CHOICES = MappingProxyType({str(i): value for i, value in enumerate(_RELIGIONS, 1)})
+
+# Console banners, built once at import
+_BANNER = "=" * 60
+_HEADER_RECOMMENDATIONS = f"\n{_BANNER}\nKENYAN NUTRITION AI - PERSONALIZED RECOMMENDATIONS\n{_BANNER}"
+_HEADER_INPUT = f"\n{_BANNER}\nKENYAN NUTRITION AI - PATIENT INFORMATION COLLECTION\n{_BANNER}"
+
+# Confirmation block shown after interactive input
+_PATIENT_SUMMARY_TEMPLATE = (
+    "\n📋 PATIENT DATA SUMMARY:\n"
+    "   Age: {age} years\n"
+    "   Weight: {weight} kg\n"
+    "   Height: {height} m\n"
+    "   Blood Sugar: {blood_sugar} mg/dL\n"
+    "   Blood Pressure: {systolic}/{diastolic} mmHg\n"
+    "   Diabetes Status: {diabetes_label}\n"
+    "   Location: {location_label}\n"
+    "   Religion: {religion_label}\n"
+    "   Dietary Restriction Override: {override_label}"
+)
+
+_DIABETES_STATUSES = frozenset(("none", "type1", "type2", "prediabetes"))
+
+# Numeric patient inputs as (field, caster, prompt, heading printed before the prompt)
+_NUMERIC_FIELDS = (
+    ("age", int, "Enter patient's age (years): ", None),
+    ("weight", float, "Enter patient's weight (kg): ", None),
+    ("height", float, "Enter patient's height (meters, e.g., 1.68): ", None),
+    ("blood_sugar", float, "Enter blood sugar level (mg/dL): ", None),
+    ("systolic", int, "  Systolic pressure (mmHg): ", "\nBlood pressure readings:"),
+    ("diastolic", int, "  Diastolic pressure (mmHg): ", None),
+)
+
+_MODE_MENU = (
+    "🏥 KENYAN NUTRITION AI AGENT\n"
+    "Choose your preferred mode:\n"
+    "  1. Interactive mode (Enter your own details)\n"
+    "  2. Demo mode (Use sample patient data)"
+)
+
+_DIABETES_MENU = (
+    "\nDiabetes status options:\n"
+    "  1. None\n"
+    "  2. Type 1 Diabetes\n"
+    "  3. Type 2 Diabetes\n"
+    "  4. Prediabetes"
+)
+
+# Interactive menu choice -> diabetes status
+_DIABETES_MAPPING = MappingProxyType({
+    "1": "none",
+    "2": "type1",
+    "3": "type2",
+    "4": "prediabetes"
+})
+
+# Representative locations offered in the interactive menu, one or two per region
+_REPRESENTATIVE_LOCATIONS = (
+    "Nairobi",      # Central
+    "Mombasa",      # Coastal
+    "Kisumu",       # Western
+    "Machakos",     # Eastern
+    "Garissa",      # Northern
+    "Kisii",        # Nyanza
+    "Nakuru",       # Rift Valley
+    "Eldoret"       # Rift Valley (major town)
+)
+
+_REGION_INDICATORS = MappingProxyType({
+    "Nairobi": "(Central)", "Mombasa": "(Coastal)", "Kisumu": "(Western)",
+    "Machakos": "(Eastern)", "Garissa": "(Northern)", "Kisii": "(Nyanza)",
+    "Nakuru": "(Rift Valley)", "Eldoret": "(Rift Valley)"
+})
+
+# Menu choice ("1"-"8") -> normalized location name
+_LOCATION_CHOICES = MappingProxyType({
+    str(i): location.lower() for i, location in enumerate(_REPRESENTATIVE_LOCATIONS, 1)
+})
+
+_LOCATION_MENU = "\n".join(
+    f"  {i}. {location} {_REGION_INDICATORS.get(location, '')}"
+    for i, location in enumerate(_REPRESENTATIVE_LOCATIONS, 1)
+)
+
+
+
+@lru_cache(maxsize=1)
+def _load_chat_openai():
+    """Import ChatOpenAI on first LLM evaluation; the OpenAI client stack is slow to import"""
+    try:
+        from langchain_openai import ChatOpenAI
+    except Exception:
+        return None
+    return ChatOpenAI
+
+
+@lru_cache(maxsize=256)
+def _pretty(key: str) -> str:
+    """Turn a snake_case report key into a display label"""
+    return key.replace('_', ' ').title()
 
 
 class RecommendationGraphState(TypedDict, total=False):
@@ -28,35 +176,74 @@ class RecommendationGraphState(TypedDict, total=False):
     evaluation: Dict[str, Any]
     summary: Dict[str, Any]
     iterations: int
+    converged: bool
     max_iterations: int
     target_score: float
     use_llm_evaluator: bool
     religion: str
     dietary_restrictions: Dict[str, bool]
-    trace: List[Dict[str, Any]]
+    # Nodes return only their own trace entries; the reducer appends them, which also lets
+    # the parallel profile/regional-foods branches write to the trace in the same step
+    trace: Annotated[List[Dict[str, Any]], operator.add]
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 class KenyanNutritionAgent:
     """Main agent that coordinates all sub-agents for comprehensive nutrition recommendations"""
+
+    __slots__ = (
+        "_llm",
+        "_recommendation_graph",
+        "_patient_agent",
+        "_regional_agent",
+        "_recommendation_agent",
+        "_regional_lookup_cache",
+        "__weakref__",
+    )
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        
-        # Initialize sub-agents
-        self.patient_agent = PatientProfileAgent()
-        self.regional_agent = RegionalFoodAgent()
-        self.recommendation_agent = FoodRecommendationAgent()
+        # Sub-agents are built on first use (see the properties below)
+        self._patient_agent = None
+        self._regional_agent = None
+        self._recommendation_agent = None
+        self._regional_lookup_cache = None
         self._llm = None
         self._recommendation_graph = self._build_recommendation_graph()
         
-        self.logger.info("Kenyan Nutrition Agent initialized successfully")
+        logger.info("Kenyan Nutrition Agent initialized successfully")
+
+    @property
+    def patient_agent(self):
+        if self._patient_agent is None:
+            from sub_agents.patient_profiles.agent import PatientProfileAgent
+            self._patient_agent = PatientProfileAgent()
+        return self._patient_agent
+
+    @property
+    def regional_agent(self):
+        if self._regional_agent is None:
+            from sub_agents.regions_for_food.agent import RegionalFoodAgent
+            self._regional_agent = RegionalFoodAgent()
+        return self._regional_agent
+
+    @property
+    def recommendation_agent(self):
+        if self._recommendation_agent is None:
+            from sub_agents.food_recommendations.agent import FoodRecommendationAgent
+            self._recommendation_agent = FoodRecommendationAgent(regional_agent=self.regional_agent)
+        return self._recommendation_agent
+
+    @property
+    def _regional_lookup(self):
+        # Regional food lists are static per location, so memoize lookups on the normalized name
+        if self._regional_lookup_cache is None:
+            self._regional_lookup_cache = lru_cache(maxsize=64)(self.regional_agent.data_loader.get_regional_foods)
+        return self._regional_lookup_cache
 
     def _build_recommendation_graph(self):
         """Build a LangGraph workflow for iterative recommendation + evaluation."""
-        if StateGraph is None or END is None:
-            self.logger.warning("LangGraph not available; graph-based workflow will use fallback path.")
+        if StateGraph is None or START is None or END is None:
+            logger.warning("LangGraph not available; graph-based workflow will use fallback path.")
             return None
 
         graph_builder = StateGraph(RecommendationGraphState)
@@ -66,9 +253,10 @@ class KenyanNutritionAgent:
         graph_builder.add_node("evaluate_recommendations", self._graph_evaluate_recommendations)
         graph_builder.add_node("improve_recommendations", self._graph_improve_recommendations)
 
-        graph_builder.set_entry_point("build_profile")
-        graph_builder.add_edge("build_profile", "fetch_regional_foods")
-        graph_builder.add_edge("fetch_regional_foods", "generate_recommendations")
+        # Regional foods depend only on location, so they are fetched alongside profile creation
+        graph_builder.add_edge(START, "build_profile")
+        graph_builder.add_edge(START, "fetch_regional_foods")
+        graph_builder.add_edge(["build_profile", "fetch_regional_foods"], "generate_recommendations")
         graph_builder.add_edge("generate_recommendations", "evaluate_recommendations")
         graph_builder.add_conditional_edges(
             "evaluate_recommendations",
@@ -78,10 +266,21 @@ class KenyanNutritionAgent:
                 "end": END,
             },
         )
-        graph_builder.add_edge("improve_recommendations", "evaluate_recommendations")
+        graph_builder.add_conditional_edges(
+            "improve_recommendations",
+            self._graph_route_after_improve,
+            {
+                "evaluate": "evaluate_recommendations",
+                "end": END,
+            },
+        )
 
         return graph_builder.compile()
 
+    def _get_regional_foods(self, location: str) -> Dict[str, List[str]]:
+        """Get regional foods for a location through the per-location cache"""
+        return self._regional_lookup(location.strip().lower())
+
     def _graph_build_profile(self, state: RecommendationGraphState) -> Dict[str, Any]:
         patient_input = state["patient_input"]
         patient_profile = self.patient_agent.create_patient_profile(
@@ -97,16 +296,16 @@ class KenyanNutritionAgent:
         )
         return {
             "patient_profile": patient_profile,
-            "trace": state.get("trace", []) + [{"step": "build_profile", "health_category": patient_profile["health_category"]}],
+            "trace": [{"step": "build_profile", "health_category": patient_profile["health_category"]}],
         }
 
     def _graph_fetch_regional_foods(self, state: RecommendationGraphState) -> Dict[str, Any]:
         location = state["patient_input"]["location"]
-        regional_foods = self.regional_agent.data_loader.get_regional_foods(location)
-        available_foods_count = sum(len(foods) for foods in regional_foods.values())
+        regional_foods = self._get_regional_foods(location)
+        available_foods_count = sum(map(len, regional_foods.values()))
         return {
             "regional_foods": regional_foods,
-            "trace": state.get("trace", []) + [{"step": "fetch_regional_foods", "available_foods": available_foods_count}],
+            "trace": [{"step": "fetch_regional_foods", "available_foods": available_foods_count}],
         }
 
     def _graph_generate_recommendations(self, state: RecommendationGraphState) -> Dict[str, Any]:
@@ -116,7 +315,7 @@ class KenyanNutritionAgent:
         )
         return {
             "recommendations": recommendations,
-            "trace": state.get("trace", []) + [{"step": "generate_recommendations"}],
+            "trace": [{"step": "generate_recommendations"}],
         }
 
     def _graph_evaluate_recommendations(self, state: RecommendationGraphState) -> Dict[str, Any]:
@@ -133,7 +332,7 @@ class KenyanNutritionAgent:
 
         return {
             "evaluation": evaluation,
-            "trace": state.get("trace", []) + [{"step": "evaluate_recommendations", "score": evaluation["score"], "method": evaluation["method"]}],
+            "trace": [{"step": "evaluate_recommendations", "score": evaluation["score"], "method": evaluation["method"]}],
         }
 
     def _graph_improve_recommendations(self, state: RecommendationGraphState) -> Dict[str, Any]:
@@ -147,9 +346,16 @@ class KenyanNutritionAgent:
         return {
             "recommendations": improved_recommendations,
             "iterations": iterations,
-            "trace": state.get("trace", []) + [{"step": "improve_recommendations", "iteration": iterations}],
+            "converged": improved_recommendations == state["recommendations"],
+            "trace": [{"step": "improve_recommendations", "iteration": iterations}],
         }
 
+    def _graph_route_after_improve(self, state: RecommendationGraphState) -> str:
+        # Unchanged recommendations would get the same evaluation and the same fixes again
+        if state.get("converged", False):
+            return "end"
+        return "evaluate"
+
     def _graph_route_after_evaluate(self, state: RecommendationGraphState) -> str:
         score = state.get("evaluation", {}).get("score", 0.0)
         target_score = state.get("target_score", 0.8)
@@ -163,8 +369,7 @@ class KenyanNutritionAgent:
     def _get_low_gi_foods(self, foods: List[str]) -> List[str]:
         low_gi_foods = []
         for food in foods:
-            nutrition = self.regional_agent.get_nutritional_info(food)
-            if nutrition.get("gi", 50) < 55:
+            if self.regional_agent.get_glycemic_index(food) < 55:
                 low_gi_foods.append(food)
         return low_gi_foods
 
@@ -188,14 +393,14 @@ class KenyanNutritionAgent:
         all_meal_foods = breakfast_foods + lunch_foods + dinner_foods + snack_foods
 
         if restrictions.get("limit_sugar", False):
-            high_gi_found = []
-            for food in all_meal_foods:
-                nutrition = self.regional_agent.get_nutritional_info(food)
-                if nutrition.get("gi", 50) >= 55:
-                    high_gi_found.append(food)
+            # Foods repeat across meals, so look each distinct food up once
+            high_gi_found = sorted(
+                food for food in set(all_meal_foods)
+                if self.regional_agent.get_glycemic_index(food) >= 55
+            )
             if high_gi_found:
                 score -= 0.35
-                issues.append(f"high_gi_meal_plan: {', '.join(sorted(set(high_gi_found)))}")
+                issues.append(f"high_gi_meal_plan: {', '.join(high_gi_found)}")
 
         preferred_foods = recommendations.get("preferred_foods", {})
         if not preferred_foods.get("lean_proteins"):
@@ -217,33 +422,36 @@ class KenyanNutritionAgent:
         }
 
     def _evaluate_recommendations_with_llm(self, profile: Dict[str, Any], recommendations: Dict[str, Any]) -> Dict[str, Any]:
-        if ChatOpenAI is None:
-            self.logger.warning("langchain_openai not available. Falling back to heuristic evaluator.")
+        chat_openai = _load_chat_openai()
+        if chat_openai is None:
+            logger.warning("langchain_openai not available. Falling back to heuristic evaluator.")
             return self._evaluate_recommendations_heuristic(profile, recommendations)
 
         if not os.getenv("OPENAI_API_KEY"):
-            self.logger.warning("OPENAI_API_KEY not set. Falling back to heuristic evaluator.")
+            logger.warning("OPENAI_API_KEY not set. Falling back to heuristic evaluator.")
             return self._evaluate_recommendations_heuristic(profile, recommendations)
 
         try:
             if self._llm is None:
-                self._llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-            prompt = (
-                "You are a strict nutrition recommendation evaluator. "
-                "Evaluate quality for diabetes/portion-control safety and practical meal diversity. "
-                "Respond with strict JSON only in this format: "
-                "{\"score\": <0.0-1.0>, \"passes\": <true/false>, \"issues\": [<strings>]}.\n\n"
-                f"Patient profile: {json.dumps(profile)}\n"
-                f"Recommendations: {json.dumps(recommendations)}"
-            )
-            response = self._llm.invoke(prompt)
-            content = response.content if isinstance(response.content, str) else json.dumps(response.content)
+                # JSON mode guarantees a bare JSON object, with no markdown fences to strip
+                self._llm = chat_openai(
+                    model="gpt-4o-mini",
+                    temperature=0,
+                    timeout=_LLM_EVALUATION_TIMEOUT_SECONDS,
+                    model_kwargs={"response_format": {"type": "json_object"}},
+                )
 
-            start_index = content.find("{")
-            end_index = content.rfind("}")
-            json_content = content[start_index:end_index + 1] if start_index != -1 and end_index != -1 else content
-            parsed = json.loads(json_content)
+            prompt = "".join((
+                _EVALUATOR_PROMPT_PREFIX,
+                "Patient profile: ", _compact_json(profile),
+                # The regional-usage debug block only restates the meal plan, so keep it out of the prompt
+                "\nRecommendations: ", _compact_json(
+                    {key: value for key, value in recommendations.items() if key != "debug_regional_usage"}
+                ),
+            ))
+            response = self._llm.invoke(prompt)
+            content = response.content if isinstance(response.content, str) else _compact_json(response.content)
+            parsed = _parse_json(content)
 
             score = float(parsed.get("score", 0.0))
             issues = parsed.get("issues", [])
@@ -256,7 +464,7 @@ class KenyanNutritionAgent:
                 "method": "llm",
             }
         except Exception as error:
-            self.logger.warning(f"LLM evaluation failed ({error}). Falling back to heuristic evaluator.")
+            logger.warning("LLM evaluation failed (%s). Falling back to heuristic evaluator.", error)
             return self._evaluate_recommendations_heuristic(profile, recommendations)
 
     def _improve_recommendations(
@@ -289,7 +497,7 @@ class KenyanNutritionAgent:
                 snacks["fruits"] = low_gi_fruits[:2]
 
         if any("missing_lean_proteins" in issue for issue in issues):
-            lean_candidates = [protein for protein in regional_foods.get("proteins", []) if protein in ["fish", "chicken", "eggs"]]
+            lean_candidates = [protein for protein in regional_foods.get("proteins", []) if protein in _LEAN_PROTEINS]
             if lean_candidates:
                 improved.setdefault("preferred_foods", {})["lean_proteins"] = lean_candidates[:2]
 
@@ -334,7 +542,7 @@ class KenyanNutritionAgent:
         }
 
         if self._recommendation_graph is None:
-            self.logger.info("Graph workflow unavailable. Using deterministic workflow fallback.")
+            logger.info("Graph workflow unavailable. Using deterministic workflow fallback.")
             base_report = self.get_nutrition_recommendations(**patient_input)
             evaluation = self._evaluate_recommendations_heuristic(
                 profile=base_report["patient_profile"],
@@ -408,11 +616,10 @@ class KenyanNutritionAgent:
         Returns:
             Complete nutrition recommendation report
         """
+        logger.info("Starting nutrition recommendation workflow")
         
-        self.logger.info("Starting nutrition recommendation workflow")
-        
-        # Step 1: Create patient profile using PatientProfileAgent
-        self.logger.info("Step 1: Creating patient profile...")
+        # Step 1: Create patient profile
+        logger.info("Step 1: Creating patient profile...")
         patient_profile = self.patient_agent.create_patient_profile(
             age=age,
             weight=weight,
@@ -424,21 +631,21 @@ class KenyanNutritionAgent:
             religion=religion,
             dietary_restrictions=dietary_restrictions,
         )
-        self.logger.info(f"Patient profile created - Health category: {patient_profile['health_category']}")
+        logger.info("Patient profile created - Health category: %s", patient_profile['health_category'])
         
-        # Step 2: Get regional foods using data loader
-        self.logger.info("Step 2: Identifying regional foods...")
-        regional_foods = self.regional_agent.data_loader.get_regional_foods(location)
-        available_foods_count = sum(len(foods) for foods in regional_foods.values())
-        self.logger.info(f"Found {available_foods_count} foods available in {location} region")
+        # Step 2: Get regional foods
+        logger.info("Step 2: Identifying regional foods...")
+        regional_foods = self._get_regional_foods(location)
+        available_foods_count = sum(map(len, regional_foods.values()))
+        logger.info("Found %d foods available in %s region", available_foods_count, location)
         
         # Step 3: Generate recommendations using FoodRecommendationAgent
-        self.logger.info("Step 3: Generating personalized food recommendations...")
+        logger.info("Step 3: Generating personalized food recommendations...")
         recommendations = self.recommendation_agent.generate_recommendations(
             patient_profile,
             regional_foods,
         )
-        self.logger.info("Food recommendations generated successfully")
+        logger.info("Food recommendations generated successfully")
         
         # Compile complete report
         complete_report = {
@@ -448,7 +655,7 @@ class KenyanNutritionAgent:
             "summary": self._generate_summary(patient_profile, recommendations)
         }
         
-        self.logger.info("Nutrition recommendation workflow completed")
+        logger.info("Nutrition recommendation workflow completed")
         return complete_report
     
     def _generate_summary(self, profile: Dict[str, Any], recommendations: Dict[str, Any]) -> Dict[str, str]:
@@ -456,21 +663,15 @@ class KenyanNutritionAgent:
         
         health_status = profile['health_category']
         diabetes_status = profile['diabetes_status']
-        bmi_category = "Normal"
-        
-        if profile['bmi'] >= 30:
-            bmi_category = "Obese"
-        elif profile['bmi'] >= 25:
-            bmi_category = "Overweight"
-        elif profile['bmi'] < 18.5:
-            bmi_category = "Underweight"
+        bmi_category = _BMI_LABELS[bisect_right(_BMI_CUTS, profile['bmi'])]
+        lean_proteins = recommendations['preferred_foods']['lean_proteins']
         
         summary = {
             "health_overview": f"Patient is {health_status} with {bmi_category} BMI ({profile['bmi']}) and {diabetes_status} diabetes status",
             "key_dietary_focus": self._get_key_dietary_focus(profile),
             "meal_frequency": recommendations['meal_timing']['frequency'],
-            "primary_foods_to_include": ", ".join(recommendations['preferred_foods']['lean_proteins'][:3]),
-            "foods_to_limit": ", ".join([food for foods in recommendations['foods_to_limit'].values() for food in foods][:3])
+            "primary_foods_to_include": ", ".join(lean_proteins if len(lean_proteins) <= 3 else lean_proteins[:3]),
+            "foods_to_limit": ", ".join(islice(chain.from_iterable(recommendations['foods_to_limit'].values()), 3))
         }
         
         return summary
@@ -478,189 +679,124 @@ class KenyanNutritionAgent:
     def _get_key_dietary_focus(self, profile: Dict[str, Any]) -> str:
         """Determine the key dietary focus based on patient profile"""
         restrictions = profile['dietary_restrictions']
-        
-        focus_areas = []
-        if restrictions['limit_sugar']:
-            focus_areas.append("blood sugar control")
-        if restrictions['portion_control']:
-            focus_areas.append("portion management")
-        if restrictions['limit_sodium']:
-            focus_areas.append("sodium reduction")
-        if restrictions['increase_fiber']:
-            focus_areas.append("fiber intake")
-        
-        return ", ".join(focus_areas) if focus_areas else "general balanced nutrition"
+        focus = ", ".join(label for key, label in _FOCUS_MAP if restrictions.get(key))
+        return focus or "general balanced nutrition"
     
     def print_recommendations(self, report: Dict[str, Any]):
         """Print a formatted version of the recommendations"""
-        print("\n" + "="*60)
-        print("KENYAN NUTRITION AI - PERSONALIZED RECOMMENDATIONS")
-        print("="*60)
+        # Collect every line first and emit the report with a single write
+        parts = [_HEADER_RECOMMENDATIONS]
         
         # Patient Summary
         profile = report['patient_profile']
         summary = report['summary']
         
-        print(f"\n📊 PATIENT PROFILE:")
-        print(f"   Age: {profile['age']} years")
-        print(f"   BMI: {profile['bmi']} kg/m²")
-        print(f"   Location: {profile['location'].title()}")
-        print(f"   Health Status: {profile['health_category'].replace('_', ' ').title()}")
-        print(f"   Daily Calorie Needs: {profile['calorie_needs']} kcal")
+        parts.append(f"\n📊 PATIENT PROFILE:")
+        parts.append(f"   Age: {profile['age']} years")
+        parts.append(f"   BMI: {profile['bmi']} kg/m²")
+        parts.append(f"   Location: {profile['location'].title()}")
+        parts.append(f"   Health Status: {_pretty(profile['health_category'])}")
+        parts.append(f"   Daily Calorie Needs: {profile['calorie_needs']} kcal")
         
-        print(f"\n🎯 HEALTH OVERVIEW:")
-        print(f"   {summary['health_overview']}")
-        print(f"   Key Focus: {summary['key_dietary_focus'].title()}")
+        parts.append(f"\n🎯 HEALTH OVERVIEW:")
+        parts.append(f"   {summary['health_overview']}")
+        parts.append(f"   Key Focus: {summary['key_dietary_focus'].title()}")
         
         # Meal Plan
         meal_plan = report['recommendations']['meal_plan']
-        print(f"\n🍽️ DAILY MEAL PLAN:")
+        parts.append(f"\n🍽️ DAILY MEAL PLAN:")
         for meal, foods in meal_plan.items():
-            print(f"\n   {meal.upper()}:")
-            for food_type, food_list in foods.items():
-                if food_list:
-                    print(f"     {food_type.title()}: {', '.join(food_list)}")
+            parts.append(f"\n   {meal.upper()}:")
+            parts.extend(
+                f"     {_pretty(food_type)}: {', '.join(food_list)}"
+                for food_type, food_list in foods.items()
+                if food_list
+            )
         
         # Preferred Foods
         preferred = report['recommendations']['preferred_foods']
-        print(f"\n✅ RECOMMENDED FOODS:")
-        for category, foods in preferred.items():
-            if foods:
-                print(f"   {category.replace('_', ' ').title()}: {', '.join(foods)}")
+        parts.append(f"\n✅ RECOMMENDED FOODS:")
+        parts.extend(
+            f"   {_pretty(category)}: {', '.join(foods)}"
+            for category, foods in preferred.items()
+            if foods
+        )
         
         # Foods to Limit
         limit_foods = report['recommendations']['foods_to_limit']
-        print(f"\n⚠️ FOODS TO LIMIT:")
-        for category, foods in limit_foods.items():
-            if foods:
-                print(f"   {category.replace('_', ' ').title()}: {', '.join(foods)}")
+        parts.append(f"\n⚠️ FOODS TO LIMIT:")
+        parts.extend(
+            f"   {_pretty(category)}: {', '.join(foods)}"
+            for category, foods in limit_foods.items()
+            if foods
+        )
         
         # Portion Guidelines
         portions = report['recommendations']['portion_guidelines']
-        print(f"\n📏 PORTION GUIDELINES:")
-        for food_type, guideline in portions.items():
-            print(f"   {food_type.title()}: {guideline}")
+        parts.append(f"\n📏 PORTION GUIDELINES:")
+        parts.extend(f"   {_pretty(food_type)}: {guideline}" for food_type, guideline in portions.items())
         
         # Meal Timing
         timing = report['recommendations']['meal_timing']
-        print(f"\n⏰ MEAL TIMING ADVICE:")
-        for key, advice in timing.items():
-            print(f"   {key.title()}: {advice}")
+        parts.append(f"\n⏰ MEAL TIMING ADVICE:")
+        parts.extend(f"   {_pretty(key)}: {advice}" for key, advice in timing.items())
         
-        print("\n" + "="*60)
+        parts.append("\n" + _BANNER)
+        sys.stdout.write("\n".join(parts) + "\n")
     
     def get_user_input(self) -> Dict[str, Any]:
         """Interactively collect patient information from user"""
-        print("\n" + "="*60)
-        print("KENYAN NUTRITION AI - PATIENT INFORMATION COLLECTION")
-        print("="*60)
+        print(_HEADER_INPUT)
         print("Please provide the following information about the patient:\n")
         
         try:
-            # Basic demographics
-            age = int(input("Enter patient's age (years): "))
-            weight = float(input("Enter patient's weight (kg): "))
-            height = float(input("Enter patient's height (meters, e.g., 1.68): "))
-            
-            # Health metrics
-            blood_sugar = float(input("Enter blood sugar level (mg/dL): "))
+            # Demographics and health metrics; an invalid entry re-prompts only that field
+            numeric_values = {}
+            for name, cast, prompt, heading in _NUMERIC_FIELDS:
+                if heading:
+                    print(heading)
+                while True:
+                    try:
+                        numeric_values[name] = cast(input(prompt))
+                        break
+                    except ValueError:
+                        print("❌ Invalid input: Please enter a numeric value.")
             
-            print("\nBlood pressure readings:")
-            systolic = int(input("  Systolic pressure (mmHg): "))
-            diastolic = int(input("  Diastolic pressure (mmHg): "))
+            age = numeric_values["age"]
+            weight = numeric_values["weight"]
+            height = numeric_values["height"]
+            blood_sugar = numeric_values["blood_sugar"]
+            systolic = numeric_values["systolic"]
+            diastolic = numeric_values["diastolic"]
             blood_pressure = {"systolic": systolic, "diastolic": diastolic}
             
             # Diabetes status
-            print("\nDiabetes status options:")
-            print("  1. None")
-            print("  2. Type 1 Diabetes")
-            print("  3. Type 2 Diabetes")
-            print("  4. Prediabetes")
+            print(_DIABETES_MENU)
             
             diabetes_choice = input("Select diabetes status (1-4): ")
-            diabetes_mapping = {
-                "1": "none",
-                "2": "type1", 
-                "3": "type2",
-                "4": "prediabetes"
-            }
-            diabetes_status = diabetes_mapping.get(diabetes_choice, "none")
+            diabetes_status = _DIABETES_MAPPING.get(diabetes_choice, "none")
             
             # Location
             print("\nAvailable regions in Kenya:")
-            regions = [
-                # Central Kenya
-                "Nairobi", "Kiambu", "Murang'a", "Nyeri", "Kirinyaga", "Nyandarua", "Meru", "Tharaka-Nithi",
-                
-                # Coastal Region
-                "Mombasa", "Kilifi", "Kwale", "Lamu", "Tana River", "Taita-Taveta",
-                
-                # Western Kenya
-                "Kisumu", "Kakamega", "Bungoma", "Vihiga", "Siaya", "Busia", "Trans-Nzoia",
-                
-                # Eastern Kenya
-                "Machakos", "Kitui", "Makueni", "Embu", "Isiolo", "Marsabit", "Moyale",
-                
-                # Northern Kenya
-                "Garissa", "Mandera", "Wajir", "Turkana", "West Pokot", "Samburu",
-                
-                # Nyanza Region
-                "Kisii", "Nyamira", "Homa Bay", "Migori", "Kericho", "Bomet",
-                
-                # Rift Valley
-                "Nakuru", "Eldoret", "Narok", "Kajiado", "Laikipia", "Nandi", "Uasin Gishu", "Elgeyo-Marakwet", "Baringo"
-            ]
-            
-            # Show representative locations from different regions
-            representative_locations = [
-                "Nairobi",      # Central
-                "Mombasa",      # Coastal
-                "Kisumu",       # Western
-                "Machakos",     # Eastern
-                "Garissa",      # Northern
-                "Kisii",        # Nyanza
-                "Nakuru",       # Rift Valley
-                "Eldoret"       # Rift Valley (major town)
-            ]
-            
             print("Common locations (representing different regions):")
-            for i, location in enumerate(representative_locations, 1):
-                # Add region indicator
-                region_indicators = {
-                    "Nairobi": "(Central)", "Mombasa": "(Coastal)", "Kisumu": "(Western)",
-                    "Machakos": "(Eastern)", "Garissa": "(Northern)", "Kisii": "(Nyanza)",
-                    "Nakuru": "(Rift Valley)", "Eldoret": "(Rift Valley)"
-                }
-                print(f"  {i}. {location} {region_indicators.get(location, '')}")
+            print(_LOCATION_MENU)
             print("  9. Other (enter manually)")
             
             location_choice = input("Select location (1-9) or enter location name: ")
             
-            if location_choice.isdigit() and 1 <= int(location_choice) <= 8:
-                location = representative_locations[int(location_choice) - 1].lower()
-            elif location_choice == "9":
-                location = input("Enter your location: ").strip().lower()
-            else:
-                location = location_choice.strip().lower()
+            location = _LOCATION_CHOICES.get(location_choice)
+            if location is None:
+                if location_choice == "9":
+                    location = input("Enter your location: ").strip().lower()
+                else:
+                    location = location_choice.strip().lower()
 
             print("\nReligion options:")
-            religions = [
-                "christianity",
-                "islam",
-                "hinduism",
-                "buddhism",
-                "judaism",
-                "polytheism",
-            ]
-            for i, value in enumerate(religions, 1):
-                print(f"  {i}. {value.title()}")
+            print(_RELIGION_MENU)
             print("  7. Prefer not to say")
 
             religion_choice = input("Select religion (1-7): ").strip()
-            if religion_choice.isdigit() and 1 <= int(religion_choice) <= 6:
-                religion = religions[int(religion_choice) - 1]
-            else:
-                religion = None
+            religion = _RELIGION_CHOICES.get(religion_choice)
 
             custom_restrictions = None
             use_custom_restrictions = input("Set custom dietary restrictions? (y/n): ").strip().lower()
@@ -687,16 +823,15 @@ class KenyanNutritionAgent:
             }
             
             # Confirmation
-            print(f"\n📋 PATIENT DATA SUMMARY:")
-            print(f"   Age: {age} years")
-            print(f"   Weight: {weight} kg")
-            print(f"   Height: {height} m")
-            print(f"   Blood Sugar: {blood_sugar} mg/dL")
-            print(f"   Blood Pressure: {systolic}/{diastolic} mmHg")
-            print(f"   Diabetes Status: {diabetes_status.replace('_', ' ').title()}")
-            print(f"   Location: {location.title()}")
-            print(f"   Religion: {(religion or 'Not specified').title()}")
-            print(f"   Dietary Restriction Override: {'Yes' if custom_restrictions else 'No'}")
+            print(_PATIENT_SUMMARY_TEMPLATE.format_map({
+                **patient_data,
+                "systolic": systolic,
+                "diastolic": diastolic,
+                "diabetes_label": _pretty(diabetes_status),
+                "location_label": location.title(),
+                "religion_label": (religion or 'Not specified').title(),
+                "override_label": 'Yes' if custom_restrictions else 'No',
+            }))
             
             confirm = input("\nIs this information correct? (y/n): ").lower()
             if confirm != 'y':
@@ -715,6 +850,69 @@ class KenyanNutritionAgent:
             print(f"❌ Error collecting input: {str(e)}")
             return None
     
+    def get_user_inputs_from_json(self, fp) -> Optional[List[Dict[str, Any]]]:
+        """Read one patient object or an array of them, validating every entry before any run"""
+        import json
+
+        try:
+            raw = json.load(fp)
+        except ValueError as e:
+            print(f"❌ Invalid patient JSON: {str(e)}", file=sys.stderr)
+            return None
+
+        entries = raw if isinstance(raw, list) else [raw]
+        if not entries:
+            print("❌ Invalid patient JSON: no patients given.", file=sys.stderr)
+            return None
+        patients = []
+        for index, entry in enumerate(entries, 1):
+            where = f" (entry {index})" if isinstance(raw, list) else ""
+            try:
+                patients.append(self._patient_data_from_json(entry))
+            except KeyError as e:
+                print(f"❌ Invalid patient JSON{where}: missing field {e}.", file=sys.stderr)
+                return None
+            except (TypeError, ValueError, AttributeError) as e:
+                print(f"❌ Invalid patient JSON{where}: {str(e)}", file=sys.stderr)
+                return None
+        return patients
+
+    def _patient_data_from_json(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate one decoded patient object into keyword arguments for the workflows"""
+        # Coerce numbers with the same field table the interactive prompts use
+        fields = {**raw, **raw["blood_pressure"]}
+        numeric_values = {name: cast(fields[name]) for name, cast, _, _ in _NUMERIC_FIELDS}
+        if numeric_values["height"] <= 0:
+            raise ValueError("height must be greater than 0")
+        diabetes_status = str(raw["diabetes_status"]).strip().lower()
+        if diabetes_status not in _DIABETES_STATUSES:
+            raise ValueError(f"unknown diabetes_status '{diabetes_status}'")
+
+        religion = raw.get("religion")
+        if religion is not None:
+            religion = str(religion).strip().lower()
+            if religion not in _RELIGIONS:
+                raise ValueError(f"unknown religion '{religion}'")
+
+        dietary_restrictions = raw.get("dietary_restrictions")
+        if dietary_restrictions is not None:
+            dietary_restrictions = {key: bool(value) for key, value in dietary_restrictions.items()}
+
+        return {
+            "age": numeric_values["age"],
+            "weight": numeric_values["weight"],
+            "height": numeric_values["height"],
+            "blood_sugar": numeric_values["blood_sugar"],
+            "blood_pressure": {
+                "systolic": numeric_values["systolic"],
+                "diastolic": numeric_values["diastolic"],
+            },
+            "diabetes_status": diabetes_status,
+            "location": str(raw["location"]).strip().lower(),
+            "religion": religion,
+            "dietary_restrictions": dietary_restrictions,
+        }
+    
     def run_interactive_session(self):
         """Run an interactive session with user input"""
         print("🏥 KENYAN NUTRITION AI AGENT")
@@ -741,30 +939,90 @@ class KenyanNutritionAgent:
             save_report = input("\n💾 Would you like to save the full report to a file? (y/n): ").lower()
             if save_report == 'y':
                 filename = f"nutrition_report_{patient_data['location']}_{patient_data['age']}y.json"
-                output_dir = Path.cwd() / "outputs"
-                output_dir.mkdir(parents=True, exist_ok=True)
-                filepath = output_dir / filename
+                _OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+                filepath = _OUTPUT_DIR / filename
                 
-                with open(filepath, 'w') as f:
-                    json.dump(recommendations, f, indent=2)
+                save_report_json(filepath, recommendations)
                 print(f"✅ Report saved to: {filepath}")
             
             print("\n🎉 Thank you for using Kenyan Nutrition AI!")
             print("Stay healthy and follow your personalized recommendations!")
             
         except Exception as e:
-            logging.error(f"Error generating recommendations: {str(e)}")
+            logger.error("Error generating recommendations: %s", e)
             print(f"❌ Error: {str(e)}")
 
+def _compact_json(value: Any) -> str:
+    """Serialize a value to compact JSON text for LLM prompts"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+
+    import json
+    return json.dumps(value, separators=(",", ":"))
+
+def _parse_json(text: str) -> Any:
+    """Parse JSON text from an LLM response, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+
+    import json
+    return json.loads(text)
+
+def save_report_json(filepath: Path, report: Dict[str, Any]) -> None:
+    """Write a report as indented JSON, using orjson's C encoder when it is installed"""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        return
+
+    import json
+    # json.dump streams through the pure-Python iterencode with one write per token;
+    # encoding up front uses the C encoder and a single write
+    with open(filepath, 'w') as f:
+        f.write(json.dumps(report, indent=2))
+
 def main():
     """Main function with options for demo or interactive mode"""
+    # Configure logging for CLI runs only, leaving library users free to set their own
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="Kenyan Nutrition AI Agent")
+    parser.add_argument(
+        "--patient-json",
+        metavar="PATH",
+        help="read patient data from a JSON file ('-' for stdin) instead of prompting",
+    )
+    args = parser.parse_args()
+    
     # Initialize the main agent
     nutrition_agent = KenyanNutritionAgent()
     
-    print("🏥 KENYAN NUTRITION AI AGENT")
-    print("Choose your preferred mode:")
-    print("  1. Interactive mode (Enter your own details)")
-    print("  2. Demo mode (Use sample patient data)")
+    if args.patient_json:
+        # Scripted mode: one structured read, no prompts; an array runs each patient in turn.
+        # Any failure exits non-zero so calling scripts can detect it.
+        try:
+            if args.patient_json == "-":
+                patients = nutrition_agent.get_user_inputs_from_json(sys.stdin)
+            else:
+                with open(args.patient_json) as f:
+                    patients = nutrition_agent.get_user_inputs_from_json(f)
+            if patients is None:
+                sys.exit(1)
+            for patient_data in patients:
+                recommendations = nutrition_agent.get_nutrition_recommendations(**patient_data)
+                nutrition_agent.print_recommendations(recommendations)
+        except OSError as e:
+            print(f"❌ Cannot read patient JSON: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\n❌ Program cancelled by user.", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            logger.error("Error in main: %s", e)
+            sys.exit(1)
+        return
+    
+    print(_MODE_MENU)
     
     try:
         mode = input("Select mode (1 or 2): ").strip()
@@ -795,11 +1053,9 @@ def main():
             nutrition_agent.print_recommendations(recommendations)
             
             # Save demo report
-            output_dir = Path.cwd() / "outputs"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            demo_report_path = output_dir / "nutrition_report_demo.json"
-            with open(demo_report_path, 'w') as f:
-                json.dump(recommendations, f, indent=2)
+            _OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+            demo_report_path = _OUTPUT_DIR / "nutrition_report_demo.json"
+            save_report_json(demo_report_path, recommendations)
             print(f"\n💾 Demo report saved to: {demo_report_path}")
             
         else:
@@ -808,7 +1064,7 @@ def main():
     except KeyboardInterrupt:
         print(f"\n❌ Program cancelled by user.")
     except Exception as e:
-        logging.error(f"Error in main: {str(e)}")
+        logger.error("Error in main: %s", e)
         print(f"❌ Error: {str(e)}")
 
 if __name__ == "__main__":
@@ -2,13 +2,34 @@
 from typing import Dict, List, Any, Optional
 import openpyxl
 import logging
+import sys
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Region names that are valid locations in their own right
+_KNOWN_REGIONS = frozenset(("central", "coastal", "western", "eastern", "northern", "nyanza", "rift_valley"))
+
+# Nutrition values returned for foods missing from the dataset
+DEFAULT_NUTRITION = {
+    "calories_per_100g": 0,
+    "carbs": 0,
+    "protein": 0,
+    "fat": 0,
+    "fiber": 0,
+    "gi": 50
+}
+
+
+
+def _normalize_location(location: str) -> str:
+    """Fold case, apostrophes and separators so spelling variants share one key"""
+    return " ".join(location.lower().replace("'", "").replace("-", " ").replace("_", " ").split())
+
 
 class KenyaFoodDataLoader:
     """Load and organize food data from Excel file"""
+    __slots__ = ("excel_path", "data", "regional_foods", "nutrition_db", "county_regions", "normalized_locations")
     
     def __init__(self, excel_path: str = "kenya_food_dataset_with_aez_subcounty.xlsx"):
         """Initialize the data loader with Excel file path"""
@@ -16,12 +37,14 @@ class KenyaFoodDataLoader:
         self.data = None
         self.regional_foods = None
         self.nutrition_db = None
+        self.county_regions = None
+        self.normalized_locations = None
         self._load_data()
     
     def _load_data(self) -> None:
         """Load data from Excel file"""
         if not self.excel_path.exists():
-            logger.warning(f"Excel file not found: {self.excel_path}. Using fallback initialization.")
+            logger.warning("Excel file not found: %s. Using fallback initialization.", self.excel_path)
             return
         
         try:
@@ -42,41 +65,42 @@ class KenyaFoodDataLoader:
             self.data = rows
             self._organize_regional_foods()
             self._organize_nutrition_db()
-            logger.info(f"Loaded {len(rows)} food items from Excel")
+            self._organize_county_regions()
+            logger.info("Loaded %d food items from Excel", len(rows))
         except Exception as e:
-            logger.error(f"Error loading Excel file: {e}")
+            logger.error("Error loading Excel file: %s", e)
             raise
     
     def _organize_regional_foods(self) -> None:
         """Organize foods by region and category"""
         self.regional_foods = {}
+        # Foods already listed per (region, category); lists keep dataset order for meal plans
+        seen = set()
         
         for row in self.data:
-            region = row.get('Region', '').lower()
-            category = row.get('Food category', '').lower()
-            food = row.get('Food', '').lower()
+            # Names repeat on every row; interning keeps one string object per distinct name
+            region = sys.intern(row.get('Region', '').lower())
+            category = sys.intern(row.get('Food category', '').lower())
+            food = sys.intern(row.get('Food', '').lower())
             
             if not region or not category or not food:
                 continue
             
-            if region not in self.regional_foods:
-                self.regional_foods[region] = {}
-            
-            if category not in self.regional_foods[region]:
-                self.regional_foods[region][category] = []
+            category_foods = self.regional_foods.setdefault(region, {}).setdefault(category, [])
             
             # Ensure no duplicates
-            if food not in self.regional_foods[region][category]:
-                self.regional_foods[region][category].append(food)
+            if (region, category, food) not in seen:
+                seen.add((region, category, food))
+                category_foods.append(food)
         
-        logger.info(f"Organized {len(self.regional_foods)} regions")
+        logger.info("Organized %d regions", len(self.regional_foods))
     
     def _organize_nutrition_db(self) -> None:
         """Organize nutritional information by food item"""
         self.nutrition_db = {}
         
         for row in self.data:
-            food = row.get('Food', '').lower()
+            food = sys.intern(row.get('Food', '').lower())
             
             if not food or food in self.nutrition_db:
                 continue
@@ -95,7 +119,23 @@ class KenyaFoodDataLoader:
             
             self.nutrition_db[food] = nutrition
         
-        logger.info(f"Organized nutrition data for {len(self.nutrition_db)} foods")
+        logger.info("Organized nutrition data for %d foods", len(self.nutrition_db))
+    
+    def _organize_county_regions(self) -> None:
+        """Map each county to the region of its first row, in dataset order"""
+        self.county_regions = {}
+        
+        for row in self.data:
+            county = sys.intern(row.get('County', '').lower())
+            region = sys.intern(row.get('Region', '').lower())
+            
+            if region and county not in self.county_regions:
+                self.county_regions[county] = region
+        
+        # Region and county names under spelling normalization ("Murang'a", "homa-bay", "rift valley")
+        self.normalized_locations = {_normalize_location(region): region for region in self.regional_foods}
+        for county, region in self.county_regions.items():
+            self.normalized_locations.setdefault(_normalize_location(county), region)
     
     def get_region_by_location(self, location: str) -> str:
         """Find region by location (county name or region name) from actual data"""
@@ -108,55 +148,44 @@ class KenyaFoodDataLoader:
         if location_lower in self.regional_foods:
             return location_lower
         
-        # Search through data for matching county
-        for row in self.data:
-            county = row.get('County', '').lower()
-            if county == location_lower:
-                region = row.get('Region', '').lower()
-                if region:
-                    return region
+        # Then check for an exact county match
+        region = self.county_regions.get(location_lower)
+        if region:
+            return region
         
-        # If direct match not found, try substring match
-        for row in self.data:
-            county = row.get('County', '').lower()
+        # Then retry both under spelling normalization
+        region = self.normalized_locations.get(_normalize_location(location_lower))
+        if region:
+            return region
+        
+        # If direct match not found, try substring match over the distinct counties
+        for county, region in self.county_regions.items():
             if location_lower in county or county in location_lower:
-                region = row.get('Region', '').lower()
-                if region:
-                    return region
+                return region
         
         # If still not found, return the location as-is (might be a region name)
         # or default to central
-        import logging
-        if location_lower not in ["central", "coastal", "western", "eastern", "northern", "nyanza", "rift_valley"]:
-            logging.getLogger(__name__).warning(f"Location '{location}' not found. Using central region as default.")
+        if location_lower not in _KNOWN_REGIONS:
+            logger.warning("Location '%s' not found. Using central region as default.", location)
         
         return location_lower if location_lower in self.regional_foods else "central"
     
     def get_regional_foods(self, location: str) -> Dict[str, List[str]]:
         """Get foods available by location, auto-detecting region from data"""
-        region = self.get_region_by_location(location)
+        if not self.regional_foods:
+            return {}
         
-        if self.regional_foods and region in self.regional_foods:
-            return self.regional_foods[region]
-        
-        return {}
+        # Single lookup; a resolved region with no foods in the data yields no foods
+        return self.regional_foods.get(self.get_region_by_location(location), {})
     
     def get_nutrition_info(self, food_item: str) -> Dict[str, Any]:
         """Get nutritional information for a food item"""
-        food_lower = food_item.lower()
-        
-        if self.nutrition_db and food_lower in self.nutrition_db:
-            return self.nutrition_db[food_lower]
+        nutrition = self.nutrition_db.get(food_item.lower()) if self.nutrition_db else None
+        if nutrition is not None:
+            return nutrition
         
         # Return default if not found
-        return {
-            "calories_per_100g": 0,
-            "carbs": 0,
-            "protein": 0,
-            "fat": 0,
-            "fiber": 0,
-            "gi": 50
-        }
+        return dict(DEFAULT_NUTRITION)
 
 
 
@@ -1,13 +1,56 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, FrozenSet
 import logging
-from ..patient_profiles.agent import PatientProfileAgent
+from itertools import chain
 from ..regions_for_food.agent import RegionalFoodAgent
 
+# Food rules as (output key, restriction flag gating the rule or None, category to draw
+# from or None for any category, candidate foods), in report order
+_PREFERRED_FOOD_RULES = (
+    # High fiber foods (good for diabetes and weight management)
+    ("high_fiber", "increase_fiber", None, ("kale", "spinach", "beans", "sweet_potatoes", "avocados")),
+    ("low_sodium", None, None, ()),
+    ("lean_proteins", None, "proteins", ("fish", "chicken", "eggs")),
+    ("complex_carbs", None, None, ("millet", "sorghum", "sweet_potatoes")),
+)
+_LIMIT_FOOD_RULES = (
+    ("high_gi_foods", "limit_sugar", None, ("rice", "watermelon", "dates")),
+    ("high_sodium_foods", None, None, ()),
+    ("high_fat_foods", "limit_saturated_fat", None, ("coconut_milk", "groundnuts")),
+)
+
+# Portion guidelines per risk tier, built once at import
+_PORTIONS_STANDARD = {
+    "grains": "1/2 cup cooked",
+    "vegetables": "1 cup raw or 1/2 cup cooked",
+    "fruits": "1 medium fruit or 1/2 cup",
+    "proteins": "palm-sized portion (3-4 oz)",
+    "legumes": "1/2 cup cooked"
+}
+_PORTIONS_SMALL = {k: f"Small {v}" for k, v in _PORTIONS_STANDARD.items()}
+_PORTIONS_MODERATE = {k: f"Moderate {v}" for k, v in _PORTIONS_STANDARD.items()}
+
+# Meal timing advice for diabetic and non-diabetic patients
+_DIABETIC_STATUSES = frozenset(("type1", "type2"))
+_TIMING_DIABETIC = {
+    "frequency": "Eat 3 main meals and 2-3 small snacks",
+    "timing": "Eat every 3-4 hours to maintain stable blood sugar",
+    "breakfast": "Within 1 hour of waking up",
+    "dinner": "At least 2-3 hours before bedtime"
+}
+_TIMING_GENERAL = {
+    "frequency": "3 main meals with optional healthy snacks",
+    "timing": "Regular meal times help maintain energy levels",
+    "breakfast": "Start your day with a balanced meal",
+    "dinner": "Light dinner 2-3 hours before bedtime"
+}
+
 class FoodRecommendationAgent:
-    def __init__(self):
+    __slots__ = ("logger", "regional_agent")
+
+    def __init__(self, regional_agent: Optional[RegionalFoodAgent] = None):
         self.logger = logging.getLogger(__name__)
-        self.patient_agent = PatientProfileAgent()
-        self.regional_agent = RegionalFoodAgent()
+        # Reuse the orchestrator's regional agent when given instead of building a duplicate
+        self.regional_agent = regional_agent if regional_agent is not None else RegionalFoodAgent()
     
     def generate_recommendations(
         self,
@@ -23,12 +66,14 @@ class FoodRecommendationAgent:
         dietary_restrictions = patient_profile["dietary_restrictions"]
         health_category = patient_profile["health_category"]
         diabetes_status = patient_profile["diabetes_status"]
+        # Every food offered in the region, for O(1) availability checks
+        available_foods = frozenset(chain.from_iterable(regional_foods.values()))
         
         recommendations = {
-            "meal_plan": self._create_meal_plan(regional_foods, dietary_restrictions, patient_profile),
-            "preferred_foods": self._get_preferred_foods(regional_foods, dietary_restrictions),
-            "foods_to_limit": self._get_foods_to_limit(regional_foods, dietary_restrictions),
-            "portion_guidelines": self._get_portion_guidelines(patient_profile),
+            "meal_plan": self._create_meal_plan(regional_foods, dietary_restrictions),
+            "preferred_foods": self._select_foods(_PREFERRED_FOOD_RULES, regional_foods, dietary_restrictions, available_foods),
+            "foods_to_limit": self._select_foods(_LIMIT_FOOD_RULES, regional_foods, dietary_restrictions, available_foods),
+            "portion_guidelines": self._get_portion_guidelines(health_category, patient_profile["bmi"] >= 30),
             "meal_timing": self._get_meal_timing_advice(diabetes_status)
         }
 
@@ -62,8 +107,7 @@ class FoodRecommendationAgent:
         }
     
     def _create_meal_plan(self, regional_foods: Dict[str, List[str]], 
-                         restrictions: Dict[str, bool], 
-                         profile: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+                         restrictions: Dict[str, bool]) -> Dict[str, Dict[str, List[str]]]:
         """Create a balanced meal plan for the day"""
         
         meal_plan = {
@@ -90,26 +134,34 @@ class FoodRecommendationAgent:
             }
         }
         
+        # Fetch each category once; GI filtering of fruits is shared by breakfast and snacks
+        grains = regional_foods.get("grains", [])
+        proteins = regional_foods.get("proteins", [])
+        vegetables = regional_foods.get("vegetables", [])
+        legumes = regional_foods.get("legumes", [])
+        low_gi_fruits = self._filter_by_gi(regional_foods.get("fruits", []), restrictions["limit_sugar"])
+        breakfast_protein = next((food for food in proteins if food in ("eggs", "milk")), None)
+        snack_nut = next((food for food in legumes if "nuts" in food), None)
+        
         # Breakfast recommendations
-        breakfast_grains = self._filter_by_gi(regional_foods.get("grains", []), restrictions["limit_sugar"])
-        meal_plan["breakfast"]["grains"] = breakfast_grains[:2]
-        meal_plan["breakfast"]["proteins"] = [food for food in regional_foods.get("proteins", []) if food in ["eggs", "milk"]][:1]
-        meal_plan["breakfast"]["fruits"] = self._filter_by_gi(regional_foods.get("fruits", []), restrictions["limit_sugar"])[:2]
+        meal_plan["breakfast"]["grains"] = self._filter_by_gi(grains, restrictions["limit_sugar"])[:2]
+        meal_plan["breakfast"]["proteins"] = [breakfast_protein] if breakfast_protein is not None else []
+        meal_plan["breakfast"]["fruits"] = low_gi_fruits[:2]
         
         # Lunch recommendations
-        meal_plan["lunch"]["grains"] = regional_foods.get("grains", [])[:1]
-        meal_plan["lunch"]["proteins"] = regional_foods.get("proteins", [])[:1]
-        meal_plan["lunch"]["vegetables"] = regional_foods.get("vegetables", [])[:3]
-        meal_plan["lunch"]["legumes"] = regional_foods.get("legumes", [])[:1]
+        meal_plan["lunch"]["grains"] = grains[:1]
+        meal_plan["lunch"]["proteins"] = proteins[:1]
+        meal_plan["lunch"]["vegetables"] = vegetables[:3]
+        meal_plan["lunch"]["legumes"] = legumes[:1]
         
         # Dinner recommendations
-        meal_plan["dinner"]["grains"] = regional_foods.get("grains", [])[:1]
-        meal_plan["dinner"]["proteins"] = regional_foods.get("proteins", [])[:1]
-        meal_plan["dinner"]["vegetables"] = regional_foods.get("vegetables", [])[:2]
+        meal_plan["dinner"]["grains"] = grains[:1]
+        meal_plan["dinner"]["proteins"] = proteins[:1]
+        meal_plan["dinner"]["vegetables"] = vegetables[:2]
         
         # Snack recommendations
-        meal_plan["snacks"]["fruits"] = self._filter_by_gi(regional_foods.get("fruits", []), restrictions["limit_sugar"])[:2]
-        meal_plan["snacks"]["nuts"] = [food for food in regional_foods.get("legumes", []) if "nuts" in food or "groundnuts" in food][:1]
+        meal_plan["snacks"]["fruits"] = low_gi_fruits[:2]
+        meal_plan["snacks"]["nuts"] = [snack_nut] if snack_nut is not None else []
         
         return meal_plan
     
@@ -118,92 +170,40 @@ class FoodRecommendationAgent:
         if not limit_sugar:
             return foods
         
-        low_gi_foods = []
-        for food in foods:
-            nutrition = self.regional_agent.get_nutritional_info(food)
-            if nutrition.get("gi", 50) < 55:  # Low GI foods
-                low_gi_foods.append(food)
+        low_gi_foods = [food for food in foods if self._gi_of(food) < 55]  # Low GI foods
         
         return low_gi_foods if low_gi_foods else foods[:2]  # Fallback to first 2 if no low GI found
+
+    def _gi_of(self, food: str) -> float:
+        """Glycemic index of a food from the regional agent's precomputed GI index"""
+        return self.regional_agent.get_glycemic_index(food)
     
-    def _get_preferred_foods(self, regional_foods: Dict[str, List[str]], 
-                           restrictions: Dict[str, bool]) -> Dict[str, List[str]]:
-        """Get foods that are particularly beneficial for the patient"""
-        preferred = {
-            "high_fiber": [],
-            "low_sodium": [],
-            "lean_proteins": [],
-            "complex_carbs": []
-        }
-        
-        # High fiber foods (good for diabetes and weight management)
-        if restrictions["increase_fiber"]:
-            high_fiber_foods = ["kale", "spinach", "beans", "sweet_potatoes", "avocados"]
-            preferred["high_fiber"] = [food for food in high_fiber_foods 
-                                     if any(food in category for category in regional_foods.values())]
-        
-        # Lean proteins
-        lean_proteins = ["fish", "chicken", "eggs"]
-        preferred["lean_proteins"] = [food for food in lean_proteins if food in regional_foods.get("proteins", [])]
-        
-        # Complex carbs
-        complex_carbs = ["millet", "sorghum", "sweet_potatoes"]
-        preferred["complex_carbs"] = [food for food in complex_carbs 
-                                    if any(food in category for category in regional_foods.values())]
-        
-        return preferred
-    
-    def _get_foods_to_limit(self, regional_foods: Dict[str, List[str]], 
-                          restrictions: Dict[str, bool]) -> Dict[str, List[str]]:
-        """Get foods that should be limited based on health conditions"""
-        limit = {
-            "high_gi_foods": [],
-            "high_sodium_foods": [],
-            "high_fat_foods": []
-        }
-        
-        if restrictions["limit_sugar"]:
-            high_gi_foods = ["rice", "watermelon", "dates"]
-            limit["high_gi_foods"] = [food for food in high_gi_foods 
-                                    if any(food in category for category in regional_foods.values())]
-        
-        if restrictions["limit_saturated_fat"]:
-            high_fat_foods = ["coconut_milk", "groundnuts"]
-            limit["high_fat_foods"] = [food for food in high_fat_foods 
-                                     if any(food in category for category in regional_foods.values())]
-        
-        return limit
+    def _select_foods(self, rules, regional_foods: Dict[str, List[str]],
+                      restrictions: Dict[str, bool],
+                      available_foods: FrozenSet[str]) -> Dict[str, List[str]]:
+        """Resolve a food-rule table against the patient's restrictions and regional availability"""
+        selected = {}
+        for key, flag, category, candidates in rules:
+            if flag is not None and not restrictions[flag]:
+                selected[key] = []
+                continue
+            pool = available_foods if category is None else frozenset(regional_foods.get(category, ()))
+            selected[key] = [food for food in candidates if food in pool]
+        return selected
     
-    def _get_portion_guidelines(self, profile: Dict[str, Any]) -> Dict[str, str]:
-        """Get portion size guidelines based on patient profile"""
-        guidelines = {
-            "grains": "1/2 cup cooked",
-            "vegetables": "1 cup raw or 1/2 cup cooked",
-            "fruits": "1 medium fruit or 1/2 cup",
-            "proteins": "palm-sized portion (3-4 oz)",
-            "legumes": "1/2 cup cooked"
-        }
-        
-        if profile["health_category"] == "high_risk":
-            guidelines = {k: f"Small {v}" for k, v in guidelines.items()}
-        elif profile["bmi"] >= 30:
-            guidelines = {k: f"Moderate {v}" for k, v in guidelines.items()}
+    def _get_portion_guidelines(self, health_category: str, obese: bool) -> Dict[str, str]:
+        """Get portion size guidelines based on risk category and whether BMI is 30 or above"""
+        if health_category == "high_risk":
+            guidelines = _PORTIONS_SMALL
+        elif obese:
+            guidelines = _PORTIONS_MODERATE
+        else:
+            guidelines = _PORTIONS_STANDARD
         
-        return guidelines
+        # Copy so reports never share (and can't mutate) the module-level tables
+        return dict(guidelines)
     
     def _get_meal_timing_advice(self, diabetes_status: str) -> Dict[str, str]:
         """Get meal timing advice based on diabetes status"""
-        if diabetes_status in ["type1", "type2"]:
-            return {
-                "frequency": "Eat 3 main meals and 2-3 small snacks",
-                "timing": "Eat every 3-4 hours to maintain stable blood sugar",
-                "breakfast": "Within 1 hour of waking up",
-                "dinner": "At least 2-3 hours before bedtime"
-            }
-        else:
-            return {
-                "frequency": "3 main meals with optional healthy snacks",
-                "timing": "Regular meal times help maintain energy levels",
-                "breakfast": "Start your day with a balanced meal",
-                "dinner": "Light dinner 2-3 hours before bedtime"
-            }
+        timing = _TIMING_DIABETIC if diabetes_status in _DIABETIC_STATUSES else _TIMING_GENERAL
+        return dict(timing)
@@ -1,7 +1,40 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 import logging
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# Diabetes statuses and health categories that drive risk scoring and restrictions
+_GLUCOSE_IMPAIRED_STATUSES = frozenset(("type1", "type2", "prediabetes"))
+_FIBER_FOCUS_STATUSES = frozenset(("type2", "prediabetes"))
+_ELEVATED_RISK_CATEGORIES = frozenset(("high_risk", "moderate_risk"))
+
+
+def _restriction_flags(diabetes_status: str, health_category: str) -> Dict[str, bool]:
+    """Dietary restriction flags implied by a diabetes status and health category"""
+    elevated_risk = health_category in _ELEVATED_RISK_CATEGORIES
+    return {
+        "limit_sugar": diabetes_status in _GLUCOSE_IMPAIRED_STATUSES,
+        "limit_sodium": elevated_risk,
+        "portion_control": elevated_risk,
+        "increase_fiber": diabetes_status in _FIBER_FOCUS_STATUSES,
+        "limit_saturated_fat": elevated_risk
+    }
+
+
+# Restriction flags for every known (diabetes status, health category) pair, computed once
+_RESTRICTION_TABLE = MappingProxyType({
+    (diabetes_status, health_category): MappingProxyType(_restriction_flags(diabetes_status, health_category))
+    for diabetes_status in ("none", "type1", "type2", "prediabetes")
+    for health_category in ("low_risk", "moderate_risk", "high_risk")
+})
 
 class PatientProfileAgent:
+    __slots__ = ("logger",)
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
@@ -22,8 +55,7 @@ class PatientProfileAgent:
             age, bmi, blood_sugar, blood_pressure, diabetes_status
         )
         
-        computed_restrictions = self.get_dietary_restrictions(diabetes_status, health_category)
-        merged_restrictions = dict(computed_restrictions)
+        merged_restrictions = self.get_dietary_restrictions(diabetes_status, health_category)
         if isinstance(dietary_restrictions, dict):
             for key, value in dietary_restrictions.items():
                 if key in merged_restrictions:
@@ -46,52 +78,104 @@ class PatientProfileAgent:
         
         return profile
     
+    def create_patient_profiles_batch(self, patients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create profiles for many patients at once, vectorizing the numeric steps with NumPy.
+
+        Each entry takes the same keyword arguments as create_patient_profile. Results match
+        calling create_patient_profile per patient; without NumPy that is exactly what happens.
+        Like calculate_bmi, raises ValueError if any height is not positive.
+        """
+        if np is None or not patients:
+            return [self.create_patient_profile(**patient) for patient in patients]
+
+        age = np.array([patient["age"] for patient in patients], dtype=np.float64)
+        weight = np.array([patient["weight"] for patient in patients], dtype=np.float64)
+        height = np.array([patient["height"] for patient in patients], dtype=np.float64)
+        # Checked up front, since the vectorized division would yield inf/negative BMIs instead of failing
+        if (height <= 0).any():
+            raise ValueError("height must be greater than 0")
+        blood_sugar = np.array([patient["blood_sugar"] for patient in patients], dtype=np.float64)
+        systolic = np.array([patient["blood_pressure"]["systolic"] for patient in patients], dtype=np.float64)
+        diastolic = np.array([patient["blood_pressure"]["diastolic"] for patient in patients], dtype=np.float64)
+        diabetes_status = np.array([patient["diabetes_status"] for patient in patients], dtype=object)
+
+        # Python's round keeps BMI identical to calculate_bmi (np.round rounds differently)
+        bmi_values = [round(value, 2) for value in (weight / (height * height)).tolist()]
+        bmi = np.array(bmi_values, dtype=np.float64)
+
+        # One boolean mask per risk-factor family, mirroring categorize_health_status
+        risk_count = (
+            (bmi >= 25).astype(np.int8)
+            + (blood_sugar > 100)
+            + ((systolic >= 130) | (diastolic >= 80))
+            + np.isin(diabetes_status, list(_GLUCOSE_IMPAIRED_STATUSES))
+        )
+        health_categories = np.select(
+            [risk_count >= 3, risk_count >= 1],
+            ["high_risk", "moderate_risk"],
+            default="low_risk",
+        ).tolist()
+
+        bmr = (10 * weight) + (6.25 * height * 100) - (5 * age) + 5
+        calorie_needs = (bmr * 1.55).astype(np.int64).tolist()
+
+        profiles = []
+        for patient, patient_bmi, health_category, calories in zip(patients, bmi_values, health_categories, calorie_needs):
+            restrictions = self.get_dietary_restrictions(patient["diabetes_status"], health_category)
+            overrides = patient.get("dietary_restrictions")
+            if isinstance(overrides, dict):
+                for key, value in overrides.items():
+                    if key in restrictions:
+                        restrictions[key] = bool(value)
+
+            profiles.append({
+                "age": patient["age"],
+                "weight": patient["weight"],
+                "height": patient["height"],
+                "bmi": patient_bmi,
+                "blood_sugar": patient["blood_sugar"],
+                "blood_pressure": patient["blood_pressure"],
+                "diabetes_status": patient["diabetes_status"],
+                "location": patient["location"],
+                "religion": patient.get("religion"),
+                "health_category": health_category,
+                "dietary_restrictions": restrictions,
+                "calorie_needs": calories,
+            })
+
+        return profiles
+    
     def calculate_bmi(self, weight: float, height: float) -> float:
         """Calculate BMI from weight (kg) and height (m)"""
-        return round(weight / (height ** 2), 2)
+        if height <= 0:
+            raise ValueError("height must be greater than 0")
+        return round(weight / (height * height), 2)
     
     def categorize_health_status(self, age: int, bmi: float, blood_sugar: float, 
                                blood_pressure: Dict[str, int], diabetes_status: str) -> str:
         """Categorize overall health status"""
-        risk_factors = []
-        
-        if bmi >= 30:
-            risk_factors.append("obesity")
-        elif bmi >= 25:
-            risk_factors.append("overweight")
-            
-        if blood_sugar > 126:
-            risk_factors.append("high_blood_sugar")
-        elif blood_sugar > 100:
-            risk_factors.append("elevated_blood_sugar")
-            
-        if blood_pressure["systolic"] >= 140 or blood_pressure["diastolic"] >= 90:
-            risk_factors.append("hypertension")
-        elif blood_pressure["systolic"] >= 130 or blood_pressure["diastolic"] >= 80:
-            risk_factors.append("elevated_bp")
-            
-        if diabetes_status in ["type1", "type2"]:
-            risk_factors.append("diabetes")
-        elif diabetes_status == "prediabetes":
-            risk_factors.append("prediabetes")
+        # Count risk-factor families (each contributes at most one, whatever its severity)
+        risk_count = (
+            (bmi >= 25)  # overweight or obesity
+            + (blood_sugar > 100)  # elevated or high blood sugar
+            + (blood_pressure["systolic"] >= 130 or blood_pressure["diastolic"] >= 80)  # elevated bp or hypertension
+            + (diabetes_status in _GLUCOSE_IMPAIRED_STATUSES)  # diabetes or prediabetes
+        )
             
-        if len(risk_factors) >= 3:
+        if risk_count >= 3:
             return "high_risk"
-        elif len(risk_factors) >= 1:
+        elif risk_count >= 1:
             return "moderate_risk"
         else:
             return "low_risk"
     
     def get_dietary_restrictions(self, diabetes_status: str, health_category: str) -> Dict[str, Any]:
         """Define dietary restrictions based on health status"""
-        restrictions = {
-            "limit_sugar": diabetes_status in ["type1", "type2", "prediabetes"],
-            "limit_sodium": health_category in ["high_risk", "moderate_risk"],
-            "portion_control": health_category in ["high_risk", "moderate_risk"],
-            "increase_fiber": diabetes_status in ["type2", "prediabetes"],
-            "limit_saturated_fat": health_category in ["high_risk", "moderate_risk"]
-        }
-        return restrictions
+        # Callers merge overrides into the result, so hand out a fresh copy of the shared row
+        row = _RESTRICTION_TABLE.get((diabetes_status, health_category))
+        if row is None:
+            return _restriction_flags(diabetes_status, health_category)
+        return dict(row)
     
     def calculate_calorie_needs(self, age: int, weight: float, height: float) -> int:
         """Calculate daily calorie needs using Mifflin-St Jeor equation (assuming moderate activity)"""
@@ -1,24 +1,74 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Mapping, Tuple
 import logging
 import sys
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from types import MappingProxyType
 
 # Add parent directory to path to import data_loader
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from data_loader import get_data_loader
+from data_loader import DEFAULT_NUTRITION, KenyaFoodDataLoader, get_data_loader
+
+
+@lru_cache(maxsize=8)
+def _build_food_indexes(data_loader: KenyaFoodDataLoader) -> Tuple[Mapping[str, FrozenSet[str]], Mapping[str, FrozenSet[str]], Mapping[str, float]]:
+    """Build the read-only lookup indexes over a loader's dataset, once per loader"""
+    # Every food per region, for O(1) availability checks
+    region_foods = {
+        region: frozenset(chain.from_iterable(categories.values()))
+        for region, categories in (data_loader.regional_foods or {}).items()
+    }
+    # Reverse index of the regions offering each food
+    food_regions = {}
+    for region, foods in region_foods.items():
+        for food in foods:
+            food_regions.setdefault(food, set()).add(region)
+    # Glycemic index column indexed by food, resolved with the same defaulting as
+    # get_nutritional_info so GI filters skip per-food record lookups
+    default_gi = DEFAULT_NUTRITION["gi"]
+    gi_by_food = {
+        food: nutrition.get("gi", default_gi) if nutrition.get("calories_per_100g", 0) != 0 else default_gi
+        for food, nutrition in (data_loader.nutrition_db or {}).items()
+    }
+    return (
+        MappingProxyType(region_foods),
+        MappingProxyType({food: frozenset(regions) for food, regions in food_regions.items()}),
+        MappingProxyType(gi_by_food),
+    )
+
 
 class RegionalFoodAgent:
+    __slots__ = ("logger", "data_loader", "regional_foods", "_gi_by_food", "_region_foods", "_food_regions")
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.data_loader = get_data_loader()
         self.regional_foods = self.data_loader.regional_foods
         self.logger.info("Regional foods loaded from Excel file")
+        # Derived indexes are shared by every agent built on the same loader
+        self._region_foods, self._food_regions, self._gi_by_food = _build_food_indexes(self.data_loader)
     
     def get_nutritional_info(self, food_item: str) -> Dict[str, Any]:
         """Get nutritional information for food items from Excel data"""
-        nutrition = self.data_loader.get_nutrition_info(food_item)
-        if nutrition.get("calories_per_100g", 0) != 0:
+        # Read the loaded table directly; going through the loader would build a default
+        # dict on a miss only for it to be replaced by another one below
+        nutrition = (self.data_loader.nutrition_db or {}).get(food_item.lower())
+        if nutrition is not None and nutrition.get("calories_per_100g", 0) != 0:
             return nutrition
         
         # Default if not found
-        return {"calories_per_100g": 0, "carbs": 0, "protein": 0, "fat": 0, "fiber": 0, "gi": 50}
+        return dict(DEFAULT_NUTRITION)
+
+    def get_glycemic_index(self, food_item: str) -> float:
+        """Get the glycemic index of a food item, defaulting like get_nutritional_info"""
+        return self._gi_by_food.get(food_item.lower(), DEFAULT_NUTRITION["gi"])
+
+    def is_available(self, food_item: str, location: str) -> bool:
+        """Check whether a food is offered anywhere in the region serving a location"""
+        region = self.data_loader.get_region_by_location(location)
+        return food_item.lower() in self._region_foods.get(region, ())
+
+    def regions_for_food(self, food_item: str) -> FrozenSet[str]:
+        """Get the regions where a food is offered"""
+        return self._food_regions.get(food_item.lower(), frozenset())